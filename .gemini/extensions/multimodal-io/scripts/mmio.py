@@ -11,23 +11,62 @@ Provides clean OOP interface for:
 """
 
 import argparse
+import asyncio
 import base64
-import mimetypes
+import concurrent.futures
+import functools
+import hashlib
+import importlib.util
+import io
+import itertools
+import json
 import os
+import re
+import shutil
+import stat
 import sys
 import time
-from dataclasses import dataclass, field
+from dataclasses import InitVar, dataclass, field
 from enum import Enum
 from pathlib import Path
 from typing import Optional, Union, List, BinaryIO
+from urllib.parse import urlsplit
 
 try:
+    import httpx  # Installed with google-genai
     from google import genai
     from google.genai import types
 except ImportError:
     print("Missing: pip install google-genai")
     sys.exit(1)
 
+# Optional SIMD base64. The SDK encodes inline bytes through the stdlib
+# base64 module at call time, so swapping its functions speeds up inline parts.
+try:
+    import pybase64
+except ImportError:
+    pybase64 = None
+else:
+    base64.b64encode = pybase64.b64encode
+    base64.b64decode = pybase64.b64decode
+    base64.urlsafe_b64encode = pybase64.urlsafe_b64encode
+    base64.urlsafe_b64decode = pybase64.urlsafe_b64decode
+
+# Optional SIMD hashing for response cache keys
+try:
+    from blake3 import blake3 as _content_hasher
+except ImportError:
+    _content_hasher = hashlib.sha256
+
+# Connection pool shared by all requests of one client
+HTTP_LIMITS = httpx.Limits(max_connections=64, max_keepalive_connections=32)
+
+# Background I/O (reference images, video frames) overlapped with request setup
+_EXEC = concurrent.futures.ThreadPoolExecutor(max_workers=4, thread_name_prefix='mmio')
+
+# Default location for MMIO(cache_dir=...) / --cache
+DEFAULT_CACHE_DIR = Path.home() / '.cache' / 'gemkit' / 'mmio'
+
 
 # Error messages for billing/quota issues
 FREE_TIER_MSG = """
@@ -84,6 +123,42 @@ def _wrap_generation_error(error: Exception, operation: str) -> Exception:
     return error
 
 
+def _poll(current, refresh, done, initial: float = 0.25, cap: float = 8.0):
+    """
+    Refresh a long-running object until done(current) is true.
+
+    Sleeps with exponential backoff (initial, 2x, 4x, ... capped at cap seconds)
+    so short jobs return quickly and long jobs don't hammer the API.
+    """
+    delay = initial
+    while not done(current):
+        time.sleep(delay)
+        delay = min(delay * 2, cap)
+        current = refresh(current)
+    return current
+
+
+async def _apoll(current, refresh, done, initial: float = 0.25, cap: float = 8.0):
+    """Async variant of _poll; refresh must return an awaitable."""
+    delay = initial
+    while not done(current):
+        await asyncio.sleep(delay)
+        delay = min(delay * 2, cap)
+        current = await refresh(current)
+    return current
+
+
+# KEY=value lines: optional `export`, double/single-quoted or bare values,
+# trailing comments ignored outside quotes; LF, CRLF and CR line endings
+_ENV_RE = re.compile(
+    rb'(?:^|(?<=[\r\n]))[ \t]*(?:export[ \t]+)?([A-Za-z_][\w.-]*)[ \t]*=[ \t]*'
+    rb'(?:"([^"\r\n]*)"|\'([^\'\r\n]*)\'|([^#\r\n]*?))[ \t]*(?:#[^\r\n]*)?(?=[\r\n]|\Z)'
+)
+
+# Set once .env discovery has run in this process
+_ENV_LOADED = False
+
+
 def _load_env_files() -> dict:
     """
     Load environment variables from .env files with fallback hierarchy.
@@ -93,8 +168,19 @@ def _load_env_files() -> dict:
     2. Project root: .env (cwd and parents up to git root)
     3. User home: ~/.env or ~/gemini.env
 
+    Runs once per process, and skips the filesystem walk entirely when both
+    GEMINI_API_KEY and GOOGLE_CLOUD_PROJECT are already exported (e.g. CI).
+
     Returns dict of loaded variables (also sets os.environ).
     """
+    global _ENV_LOADED
+    if _ENV_LOADED:
+        return {}
+    _ENV_LOADED = True
+
+    if os.environ.get('GEMINI_API_KEY') and os.environ.get('GOOGLE_CLOUD_PROJECT'):
+        return {}
+
     loaded = {}
     script_dir = Path(__file__).parent.parent  # multimodal-io/
 
@@ -111,8 +197,10 @@ def _load_env_files() -> dict:
     ])
 
     # 2. Project root (search upward for .git or .env)
+    # Lazy walk: ancestors above the git root are never materialized.
+    # Candidates are stat()ed once, in _read_env_file.
     cwd = Path.cwd()
-    for parent in [cwd] + list(cwd.parents):
+    for parent in itertools.chain((cwd,), cwd.parents):
         env_paths.append(parent / '.env')
         if (parent / '.git').exists():
             break  # Stop at git root
@@ -122,11 +210,7 @@ def _load_env_files() -> dict:
 
     # Load in order (later files override earlier)
     for env_path in env_paths:
-        if env_path.exists() and env_path.is_file():
-            try:
-                loaded.update(_parse_env_file(env_path))
-            except Exception:
-                pass  # Skip unparseable files
+        loaded.update(_read_env_file(env_path))
 
     # Apply to environment
     for key, value in loaded.items():
@@ -136,55 +220,83 @@ def _load_env_files() -> dict:
     return loaded
 
 
+def _read_env_file(filepath: Path) -> dict:
+    """Parse a .env file if it is a regular file (single stat)."""
+    try:
+        if not stat.S_ISREG(filepath.stat().st_mode):
+            return {}
+        return _parse_env_file(filepath)
+    except Exception:
+        return {}  # Skip missing or unparseable files
+
+
 def _parse_env_file(filepath: Path) -> dict:
     """Parse a .env file into a dict. Handles quotes, comments, encoding issues."""
     result = {}
 
     try:
         content = filepath.read_bytes()
-        # Remove BOM if present
+        # Remove BOM if present; UTF-16 (PowerShell default) is re-encoded as UTF-8
         if content.startswith(b'\xef\xbb\xbf'):
             content = content[3:]
-        # Decode and strip null characters
-        content = content.decode('utf-8', errors='ignore')
-        content = content.replace('\x00', '')
+        elif content.startswith((b'\xff\xfe', b'\xfe\xff')):
+            content = content.decode('utf-16', errors='ignore').encode('utf-8')
+        # Strip null characters (stays bytes; only matches get decoded)
+        content = content.translate(None, b'\x00')
     except Exception:
         return result
 
-    for line in content.splitlines():
-        line = line.strip()
-        if not line or line.startswith('#'):
-            continue
+    for key, dquoted, squoted, bare in _ENV_RE.findall(content):
+        # findall yields b'' for unmatched groups; only one value form matches
+        value = dquoted or squoted or bare.strip()
+        try:
+            result[key.decode('ascii')] = value.decode('utf-8')
+        except UnicodeDecodeError:
+            result[key.decode('ascii')] = value.decode('latin-1')
+
+    return result
 
-        if '=' not in line:
-            continue
 
-        key, _, value = line.partition('=')
-        key = key.strip()
-        value = value.strip()
+# Auto-load .env files on module import
+_load_env_files()
 
-        # Remove surrounding quotes
-        if len(value) >= 2:
-            if (value[0] == '"' and value[-1] == '"') or \
-               (value[0] == "'" and value[-1] == "'"):
-                value = value[1:-1]
 
-        # Remove inline comments (but not inside quotes)
-        if '#' in value and not value.startswith(('"', "'")):
-            value = value.split('#')[0].strip()
+_YT_HOSTS = frozenset({'youtube.com', 'www.youtube.com', 'm.youtube.com', 'music.youtube.com'})
 
-        # Skip if key/value has invalid characters
-        if '\x00' in key or '\x00' in value:
-            continue
 
-        if key:
-            result[key] = value
+@functools.lru_cache(maxsize=256)
+def _is_youtube_url(source: str) -> bool:
+    """Check if source is a YouTube video URL (watch, shorts, or youtu.be link)."""
+    if '://' not in source[:10]:
+        return False
+    try:
+        url = urlsplit(source)
+        host = url.hostname
+    except ValueError:
+        return False
+    if host == 'youtu.be':
+        return len(url.path) > 1
+    return host in _YT_HOSTS and (url.path == '/watch' or url.path.startswith('/shorts/'))
+
 
-    return result
+def _http_options() -> Optional[types.HttpOptions]:
+    """
+    HTTP/2 keep-alive pool for the SDK's httpx clients (needs httpx[http2]).
 
+    Concurrent requests multiplex over one TLS connection instead of paying a
+    handshake each. The async client is left alone when aiohttp is installed,
+    since the SDK then routes async_client_args to aiohttp instead of httpx.
+    """
+    if importlib.util.find_spec('h2') is None:
+        return None
+    if 'client_args' not in getattr(types.HttpOptions, 'model_fields', {}):
+        return None  # SDK predates custom client args
 
-# Auto-load .env files on module import
-_load_env_files()
+    pool_args = {'http2': True, 'limits': HTTP_LIMITS}
+    options = {'client_args': pool_args}
+    if importlib.util.find_spec('aiohttp') is None:
+        options['async_client_args'] = dict(pool_args)
+    return types.HttpOptions(**options)
 
 
 class MediaResolution(Enum):
@@ -201,24 +313,49 @@ class ThinkingLevel(Enum):
     HIGH = "high"
 
 
-@dataclass
+# Slotted dataclasses need Python 3.10+; 3.9 falls back to plain dataclasses
+_slotted_dataclass = functools.partial(dataclass, slots=True) if sys.version_info >= (3, 10) else dataclass
+
+
+@_slotted_dataclass
 class GeneratedMedia:
-    """Container for generated media output."""
-    data: bytes
+    """Container for generated media output. File-backed media (path only) loads lazily."""
+    data: InitVar[Optional[bytes]] = None
     path: Optional[str] = None
     mime_type: str = "application/octet-stream"
     metadata: dict = field(default_factory=dict)
+    _data: Optional[bytes] = field(default=None, init=False, repr=False)
+
+    def __post_init__(self, data: Optional[bytes]):
+        self._data = data
+
+    def _get_data(self) -> bytes:
+        """Media bytes, read from path on access when not held in memory."""
+        if self._data is not None:
+            return self._data
+        if self.path is None:
+            raise ValueError("GeneratedMedia has neither data nor path")
+        return Path(self.path).read_bytes()
 
     def save(self, filepath: str) -> str:
-        """Save media to file and return path."""
+        """Save media to file and return path. File-backed media is copied without loading it."""
         Path(filepath).parent.mkdir(parents=True, exist_ok=True)
-        with open(filepath, 'wb') as f:
-            f.write(self.data)
+        if self._data is None and self.path:
+            if Path(self.path).resolve() != Path(filepath).resolve():
+                shutil.copyfile(self.path, filepath)
+        else:
+            with open(filepath, 'wb') as f:
+                f.write(self.data)
         self.path = filepath
         return filepath
 
 
-@dataclass
+# Attached after class creation: a property in the class body would become the
+# default of the `data` init parameter
+GeneratedMedia.data = property(GeneratedMedia._get_data)
+
+
+@_slotted_dataclass
 class ProcessResult:
     """Container for processing results."""
     text: Optional[str] = None
@@ -226,6 +363,7 @@ class ProcessResult:
     tokens_used: int = 0
     duration_ms: int = 0
     model: str = ""
+    metadata: dict = field(default_factory=dict)
 
 
 class MMIO:
@@ -247,6 +385,11 @@ class MMIO:
         vid.save("output.mp4")
     """
 
+    __slots__ = (
+        'api_key', 'client', 'default_resolution', 'default_thinking',
+        'inline_threshold', 'auto_resize', 'max_edge', 'cache_dir', '_output_dir',
+    )
+
     # Model defaults by task
     MODELS = {
         'analyze': 'gemini-3-flash-preview',
@@ -265,12 +408,27 @@ class MMIO:
         '.webm': 'video/webm', '.mkv': 'video/x-matroska',
         '.pdf': 'application/pdf', '.txt': 'text/plain',
     }
+    _MIME_TO_EXT = {v: k for k, v in MIME_MAP.items()}
+
+    _AUDIO_EXTS = frozenset({'.mp3', '.wav', '.flac', '.aac', '.ogg', '.m4a'})
+
+    # Inline parts are base64-encoded into the JSON body; the File API uses a
+    # multipart resumable upload of the raw bytes, so binary media goes there
+    # once it passes INLINE_THRESHOLD. Small text payloads stay inline up to
+    # MAX_INLINE_SIZE (request limit is 20MB).
+    INLINE_THRESHOLD = 1024 * 1024  # 1MB
+    MAX_INLINE_SIZE = 15 * 1024 * 1024  # 15MB
+    INLINE_MIMES = frozenset({'text/plain', 'application/json'})
 
     def __init__(
         self,
         api_key: Optional[str] = None,
         default_resolution: MediaResolution = MediaResolution.MEDIUM,
         default_thinking: ThinkingLevel = ThinkingLevel.LOW,
+        inline_threshold: int = INLINE_THRESHOLD,
+        auto_resize: bool = False,
+        max_edge: int = 1024,
+        cache_dir: Optional[Union[str, Path]] = None,
     ):
         """
         Initialize MMIO client.
@@ -279,76 +437,225 @@ class MMIO:
             api_key: Gemini API key (defaults to GEMINI_API_KEY env var)
             default_resolution: Default media resolution for inputs
             default_thinking: Default thinking level for complex tasks
+            inline_threshold: Max bytes sent inline; larger media uses File API
+            auto_resize: Downscale large input images before sending
+            max_edge: Longest image edge in pixels when auto_resize is on
+            cache_dir: Cache process() responses here (disabled when None)
         """
         self.api_key = api_key or os.getenv('GEMINI_API_KEY')
         if not self.api_key:
             raise ValueError("GEMINI_API_KEY required")
 
-        self.client = genai.Client(api_key=self.api_key)
+        self.client = genai.Client(api_key=self.api_key, http_options=_http_options())
         self.default_resolution = default_resolution
         self.default_thinking = default_thinking
+        self.inline_threshold = min(inline_threshold, self.MAX_INLINE_SIZE)
+        self.auto_resize = auto_resize
+        self.max_edge = max_edge
+        self.cache_dir = Path(cache_dir) if cache_dir else None
         self._output_dir = Path.cwd() / "generated"
 
-    def _get_mime(self, filepath: Union[str, Path]) -> str:
+    @classmethod
+    def _get_mime(cls, filepath: Union[str, Path]) -> str:
         """Determine MIME type from file extension."""
         ext = Path(filepath).suffix.lower()
-        return self.MIME_MAP.get(ext, 'application/octet-stream')
+        return cls.MIME_MAP.get(ext, 'application/octet-stream')
 
-    def _is_youtube_url(self, source: str) -> bool:
-        """Check if source is a YouTube URL."""
-        if not isinstance(source, str):
-            return False
-        yt_patterns = ['youtube.com/watch', 'youtu.be/', 'youtube.com/shorts']
-        return any(p in source for p in yt_patterns)
+    def _load_media(self, source: Union[str, Path, bytes, BinaryIO], resize: bool = True) -> tuple:
+        """
+        Resolve media from various sources without reading files into memory.
 
-    def _load_media(self, source: Union[str, Path, bytes, BinaryIO]) -> tuple:
-        """Load media from various sources. Returns (data, mime_type) or (url, 'youtube')."""
+        Returns (ref, mime_type, size) where ref is bytes, a Path for files on
+        disk, or the URL itself with mime_type 'youtube'. Images are downscaled
+        when auto_resize is enabled and resize is True.
+        """
         if isinstance(source, bytes):
-            return source, 'application/octet-stream'
+            return source, 'application/octet-stream', len(source)
 
         if hasattr(source, 'read'):
-            return source.read(), 'application/octet-stream'
+            data = source.read()
+            return data, 'application/octet-stream', len(data)
 
         # Check for YouTube URL first
-        if isinstance(source, str) and self._is_youtube_url(source):
-            return source, 'youtube'
+        if isinstance(source, str) and _is_youtube_url(source):
+            return source, 'youtube', 0
 
         path = Path(source)
         if not path.exists():
             raise FileNotFoundError(f"File not found: {source}")
 
-        return path.read_bytes(), self._get_mime(path)
+        mime_type = self._get_mime(path)
+        if resize and self.auto_resize and mime_type.startswith('image/') and mime_type != 'image/gif':
+            data = self._downscale_image(path)
+            if data is not None:
+                return data, 'image/jpeg', len(data)
 
-    def _should_use_file_api(self, data: bytes) -> bool:
-        """Determine if File API should be used based on size."""
-        return len(data) > 15 * 1024 * 1024  # 15MB threshold
+        return path, mime_type, path.stat().st_size
 
-    def _upload_file(self, data: bytes, mime_type: str, name: str = "upload") -> any:
+    def _load_media_bytes(self, source: Union[str, Path, bytes, BinaryIO], resize: bool = True) -> tuple:
+        """Load media fully into memory. Returns (data, mime_type)."""
+        ref, mime_type, _ = self._load_media(source, resize=resize)
+        if isinstance(ref, Path):
+            ref = ref.read_bytes()
+        return ref, mime_type
+
+    def _downscale_image(self, path: Path) -> Optional[bytes]:
+        """Shrink image so its longest edge is max_edge. Returns JPEG bytes, or None if unchanged."""
+        # Deferred import: Pillow is only needed once a resize actually happens
+        try:
+            from PIL import Image, ImageOps
+        except ImportError:
+            return None  # Pillow not installed: send original
+
+        try:
+            with Image.open(path) as img:
+                w, h = img.size
+                scale = self.max_edge / max(w, h)
+                if scale >= 1:
+                    return None  # Already small enough, skip decode
+
+                # Honor EXIF orientation since re-encoding drops the tag
+                img = ImageOps.exif_transpose(img)
+
+                # JPEG has no alpha: composite transparency onto white, not black
+                if img.mode in ('RGBA', 'LA') or (img.mode == 'P' and 'transparency' in img.info):
+                    rgba = img.convert('RGBA')
+                    img = Image.new('RGB', rgba.size, (255, 255, 255))
+                    img.paste(rgba, mask=rgba.getchannel('A'))
+                elif img.mode not in ('RGB', 'L'):
+                    img = img.convert('RGB')
+
+                w, h = img.size
+                img = img.resize((max(1, int(w * scale)), max(1, int(h * scale))), Image.LANCZOS)
+
+            buf = io.BytesIO()
+            img.save(buf, 'JPEG', quality=90)
+            return buf.getvalue()
+        except (Image.UnidentifiedImageError, OSError):
+            return None  # Pillow can't decode it: send original
+
+    def _should_use_file_api(self, size: int, mime_type: str) -> bool:
+        """Determine if File API should be used based on size and type."""
+        if mime_type in self.INLINE_MIMES:
+            return size > self.MAX_INLINE_SIZE
+        return size > self.inline_threshold
+
+    def _upload_args(self, ref: Union[bytes, Path], mime_type: str, name: str) -> tuple:
+        """Build (file, config) for files.upload. Paths are streamed by the SDK."""
+        if isinstance(ref, Path):
+            return ref, types.UploadFileConfig(mime_type=mime_type, display_name=ref.name)
+
+        # Get extension from mime type for the display name
+        ext = self._MIME_TO_EXT.get(mime_type, '.bin')
+
+        # Upload straight from memory (no temp file round-trip)
+        return io.BytesIO(ref), types.UploadFileConfig(mime_type=mime_type, display_name=f"{name}{ext}")
+
+    def _upload_file(self, ref: Union[bytes, Path], mime_type: str, name: str = "upload") -> any:
         """Upload file to Gemini File API."""
-        import tempfile
+        file, config = self._upload_args(ref, mime_type, name)
+        uploaded = self.client.files.upload(file=file, config=config)
+        # Wait for processing if needed
+        return _poll(
+            uploaded,
+            lambda u: self.client.files.get(name=u.name),
+            lambda u: u.state.name != 'PROCESSING',
+        )
 
-        # Get extension from mime type for temp file
-        ext_map = {v: k for k, v in self.MIME_MAP.items()}
-        ext = ext_map.get(mime_type, '.bin')
+    async def _aupload_file(
+        self, aclient, ref: Union[bytes, Path], mime_type: str, name: str = "upload"
+    ) -> any:
+        """Upload file to Gemini File API without blocking the event loop."""
+        file, config = self._upload_args(ref, mime_type, name)
+        uploaded = await aclient.files.upload(file=file, config=config)
+        return await _apoll(
+            uploaded,
+            lambda u: aclient.files.get(name=u.name),
+            lambda u: u.state.name != 'PROCESSING',
+        )
 
-        # Use proper temp directory (cross-platform)
-        with tempfile.NamedTemporaryFile(suffix=ext, delete=False) as tmp:
-            tmp.write(data)
-            temp_path = Path(tmp.name)
+    @staticmethod
+    def _digest(ref: Union[bytes, str, Path]) -> str:
+        """Hash media content: bytes, a file on disk, or a URL string."""
+        if isinstance(ref, Path):
+            with open(ref, 'rb') as f:
+                if hasattr(hashlib, 'file_digest'):  # Python 3.11+
+                    # readinto() a reused buffer straight from the fd, no per-chunk bytes
+                    return hashlib.file_digest(f, _content_hasher).hexdigest()
+                hasher = _content_hasher()
+                for chunk in iter(lambda: f.read(1024 * 1024), b''):
+                    hasher.update(chunk)
+                return hasher.hexdigest()
+        if isinstance(ref, str):
+            ref = ref.encode('utf-8')
+        return _content_hasher(ref).hexdigest()
+
+    def _cache_path(self, ref, prompt: str, model: str, config) -> Optional[Path]:
+        """Cache file for a request, keyed by media content, prompt, model and config."""
+        if self.cache_dir is None:
+            return None
+        key = '|'.join([
+            self._digest(ref),
+            hashlib.sha1(prompt.encode('utf-8')).hexdigest(),
+            model,
+            config.model_dump_json(exclude_none=True) if config else '',
+        ])
+        return self.cache_dir / f"{hashlib.sha256(key.encode('utf-8')).hexdigest()}.json"
+
+    @staticmethod
+    def _cache_get(path: Optional[Path]) -> Optional[ProcessResult]:
+        """Load a cached result, or None on miss."""
+        if path is None or not path.is_file():
+            return None
+        try:
+            entry = json.loads(path.read_text(encoding='utf-8'))
+        except (OSError, ValueError):
+            return None  # Corrupt entry: treat as miss
+        return ProcessResult(
+            text=entry.get('text'),
+            tokens_used=entry.get('tokens_used', 0),
+            model=entry.get('model', ''),
+            metadata={'cached': True},
+        )
 
+    @staticmethod
+    def _cache_put(path: Optional[Path], result: ProcessResult) -> None:
+        """Store a result atomically. Cache write failures are ignored."""
+        if path is None or result.text is None:
+            return
         try:
-            # Pass mime_type to File API
-            uploaded = self.client.files.upload(
-                file=str(temp_path),
-                config=types.UploadFileConfig(mime_type=mime_type)
-            )
-            # Wait for processing if needed
-            while uploaded.state.name == 'PROCESSING':
-                time.sleep(1)
-                uploaded = self.client.files.get(name=uploaded.name)
-            return uploaded
-        finally:
-            temp_path.unlink(missing_ok=True)
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = path.with_suffix(f'.{os.getpid()}.tmp')
+            tmp.write_text(json.dumps({
+                'text': result.text,
+                'tokens_used': result.tokens_used,
+                'model': result.model,
+            }), encoding='utf-8')
+            os.replace(tmp, path)
+        except OSError:
+            pass
+
+    def _media_part(self, source: Union[str, Path, bytes, BinaryIO]) -> types.Part:
+        """Build a content part for source, uploading via File API when large."""
+        return self._part_from_ref(*self._load_media(source))
+
+    def _part_from_ref(self, ref: Union[bytes, str, Path], mime_type: str, size: int) -> types.Part:
+        """Build a content part from _load_media output (YouTube URI, File API upload, or inline)."""
+        if mime_type == 'youtube':
+            return types.Part.from_uri(file_uri=ref, mime_type='video/mp4')
+        if self._should_use_file_api(size, mime_type):
+            uploaded = self._upload_file(ref, mime_type)
+            return types.Part.from_uri(file_uri=uploaded.uri, mime_type=mime_type)
+        data = ref.read_bytes() if isinstance(ref, Path) else ref
+        return types.Part.from_bytes(data=data, mime_type=mime_type)
+
+    def _content_config(self, output_json: bool) -> Optional[types.GenerateContentConfig]:
+        """Build generate_content config for processing requests."""
+        config_args = {}
+        if output_json:
+            config_args['response_mime_type'] = 'application/json'
+
+        return types.GenerateContentConfig(**config_args) if config_args else None
 
     def process(
         self,
@@ -377,25 +684,17 @@ class MMIO:
         model = model or self.MODELS['analyze']
         resolution = resolution or self.default_resolution
 
-        # Load media
-        data, mime_type = self._load_media(source)
+        # Resolve media (files stay on disk until needed)
+        ref, mime_type, size = self._load_media(source)
+        config = self._content_config(output_json)
 
-        # Build content parts
-        if mime_type == 'youtube':
-            # YouTube URL - use directly with from_uri
-            media_part = types.Part.from_uri(file_uri=data, mime_type='video/mp4')
-        elif self._should_use_file_api(data):
-            uploaded = self._upload_file(data, mime_type)
-            media_part = types.Part.from_uri(file_uri=uploaded.uri, mime_type=mime_type)
-        else:
-            media_part = types.Part.from_bytes(data=data, mime_type=mime_type)
+        cache_path = self._cache_path(ref, prompt, model, config)
+        cached = self._cache_get(cache_path)
+        if cached is not None:
+            return cached
 
-        # Build config
-        config_args = {}
-        if output_json:
-            config_args['response_mime_type'] = 'application/json'
-
-        config = types.GenerateContentConfig(**config_args) if config_args else None
+        # Build content parts
+        media_part = self._part_from_ref(ref, mime_type, size)
 
         # Generate
         response = self.client.models.generate_content(
@@ -404,11 +703,108 @@ class MMIO:
             config=config,
         )
 
-        return ProcessResult(
+        result = ProcessResult(
             text=response.text if hasattr(response, 'text') else None,
             duration_ms=int((time.time() - start) * 1000),
             model=model,
         )
+        self._cache_put(cache_path, result)
+        return result
+
+    def _run_async(self, batch):
+        """
+        Run batch(aclient) to completion on a fresh event loop.
+
+        The SDK's async HTTP client is bound to the loop it first ran on, so
+        each run gets its own client and closes it before the loop ends.
+        """
+        async def _main():
+            client = genai.Client(api_key=self.api_key, http_options=_http_options())
+            try:
+                return await batch(client.aio)
+            finally:
+                # close()/aclose() are missing on older SDKs
+                if hasattr(client.aio, 'aclose'):
+                    await client.aio.aclose()
+                if hasattr(client, 'close'):
+                    client.close()
+
+        return asyncio.run(_main())
+
+    async def _aprocess(
+        self,
+        aclient,
+        source: Union[str, Path, bytes],
+        prompt: str,
+        model: Optional[str] = None,
+        resolution: Optional[MediaResolution] = None,
+        thinking: Optional[ThinkingLevel] = None,
+        output_json: bool = False,
+    ) -> ProcessResult:
+        """Async counterpart of process() on the given async client (see _run_async)."""
+        start = time.time()
+        model = model or self.MODELS['analyze']
+        resolution = resolution or self.default_resolution
+
+        # File I/O happens off the event loop
+        ref, mime_type, size = await asyncio.to_thread(self._load_media, source)
+        config = self._content_config(output_json)
+
+        cache_path = await asyncio.to_thread(self._cache_path, ref, prompt, model, config)
+        cached = self._cache_get(cache_path)
+        if cached is not None:
+            return cached
+
+        # Only the upload needs an async path; other parts build off the loop
+        if self._should_use_file_api(size, mime_type):
+            uploaded = await self._aupload_file(aclient, ref, mime_type)
+            media_part = types.Part.from_uri(file_uri=uploaded.uri, mime_type=mime_type)
+        else:
+            media_part = await asyncio.to_thread(self._part_from_ref, ref, mime_type, size)
+
+        response = await aclient.models.generate_content(
+            model=model,
+            contents=[media_part, prompt],
+            config=config,
+        )
+
+        result = ProcessResult(
+            text=response.text if hasattr(response, 'text') else None,
+            duration_ms=int((time.time() - start) * 1000),
+            model=model,
+        )
+        self._cache_put(cache_path, result)
+        return result
+
+    def process_many(
+        self,
+        sources: List[Union[str, Path, bytes]],
+        prompt: str,
+        concurrency: int = 8,
+        **kwargs,
+    ) -> List[ProcessResult]:
+        """
+        Process many media inputs with the same prompt concurrently.
+
+        Args:
+            sources: File paths, bytes, file-like objects, or YouTube URLs
+            prompt: Instruction applied to every source
+            concurrency: Maximum number of requests in flight
+            **kwargs: Passed through to process() (model, output_json, ...)
+
+        Returns:
+            List of ProcessResult in the same order as sources
+        """
+        async def _gather(aclient) -> List[ProcessResult]:
+            sem = asyncio.Semaphore(max(1, concurrency))
+
+            async def _run(src) -> ProcessResult:
+                async with sem:
+                    return await self._aprocess(aclient, src, prompt, **kwargs)
+
+            return list(await asyncio.gather(*(_run(src) for src in sources)))
+
+        return self._run_async(_gather)
 
     def imagine(
         self,
@@ -442,10 +838,75 @@ class MMIO:
         # Gemini models use generate_content with IMAGE modality
         return self._imagine_gemini(prompt, model, ratio, size, reference)
 
-    def _imagine_imagen(
-        self, prompt: str, model: str, ratio: str, size: str, count: int
-    ) -> GeneratedMedia:
-        """Generate image using Imagen 4 API."""
+    def imagine_many(
+        self,
+        prompts: List[str],
+        model: Optional[str] = None,
+        ratio: str = "1:1",
+        size: str = "1K",
+        reference: Optional[Union[str, Path, bytes]] = None,
+        concurrency: int = 4,
+    ) -> List[GeneratedMedia]:
+        """
+        Generate one image per prompt with concurrent requests.
+
+        With an Imagen model and identical prompts, requests are collapsed into
+        numberOfImages batches (up to 4 images per request).
+
+        Args:
+            prompts: Image descriptions
+            model: Model to use (default: gemini-2.5-flash-image)
+            ratio: Aspect ratio (1:1, 16:9, 9:16, 4:3, 3:4, etc.)
+            size: Image size (1K, 2K, 4K)
+            reference: Optional reference image shared by all prompts (Gemini only)
+            concurrency: Maximum number of requests in flight
+
+        Returns:
+            List of GeneratedMedia in the same order as prompts
+
+        Raises:
+            RuntimeError: If any prompt yields no image (e.g. safety-filtered)
+        """
+        model = model or self.MODELS['imagine']
+
+        async def _gather(aclient) -> List[GeneratedMedia]:
+            sem = asyncio.Semaphore(max(1, concurrency))
+
+            if model.startswith('imagen-'):
+                if len(set(prompts)) == 1:
+                    counts = [min(4, len(prompts) - i) for i in range(0, len(prompts), 4)]
+                    jobs = [(prompts[0], n) for n in counts]
+                else:
+                    jobs = [(p, 1) for p in prompts]
+
+                async def _imagen(job) -> List[GeneratedMedia]:
+                    prompt, count = job
+                    async with sem:
+                        batch = await self._aimagine_imagen(aclient, prompt, model, ratio, size, count)
+                    # Filtered images would shift later results out of prompt order
+                    if len(batch) != count:
+                        raise RuntimeError(
+                            f"No image generated for prompt {prompt!r} ({len(batch)}/{count} returned)"
+                        )
+                    return batch
+
+                batches = await asyncio.gather(*(_imagen(job) for job in jobs))
+                return [media for batch in batches for media in batch]
+
+            # Resolve the shared reference once, not per prompt
+            ref_part = await asyncio.to_thread(self._media_part, reference) if reference else None
+
+            async def _gemini(prompt: str) -> GeneratedMedia:
+                async with sem:
+                    return await self._aimagine_gemini(aclient, prompt, model, ratio, size, ref_part)
+
+            return list(await asyncio.gather(*(_gemini(p) for p in prompts)))
+
+        return self._run_async(_gather)
+
+    @staticmethod
+    def _imagen_config(model: str, ratio: str, size: str, count: int) -> types.GenerateImagesConfig:
+        """Build Imagen request config."""
         config_args = {
             'numberOfImages': min(count, 4),
             'aspectRatio': ratio,
@@ -455,55 +916,71 @@ class MMIO:
         if 'fast' not in model.lower():
             config_args['imageSize'] = size
 
+        return types.GenerateImagesConfig(**config_args)
+
+    @staticmethod
+    def _imagen_media(response, model: str, ratio: str) -> List[GeneratedMedia]:
+        """Convert an Imagen response into GeneratedMedia, one per image."""
+        count = len(response.generated_images)
+        return [
+            GeneratedMedia(
+                data=img.image.image_bytes,
+                mime_type='image/png',
+                metadata={'model': model, 'ratio': ratio, 'count': count},
+            )
+            for img in response.generated_images
+        ]
+
+    def _imagine_imagen(
+        self, prompt: str, model: str, ratio: str, size: str, count: int
+    ) -> GeneratedMedia:
+        """Generate image using Imagen 4 API."""
         try:
             response = self.client.models.generate_images(
                 model=model,
                 prompt=prompt,
-                config=types.GenerateImagesConfig(**config_args),
+                config=self._imagen_config(model, ratio, size, count),
             )
         except Exception as e:
             raise _wrap_generation_error(e, f"Image generation ({model})")
 
         # Return first image
-        img = response.generated_images[0]
-        return GeneratedMedia(
-            data=img.image.image_bytes,
-            mime_type='image/png',
-            metadata={'model': model, 'ratio': ratio, 'count': len(response.generated_images)},
-        )
-
-    def _imagine_gemini(
-        self, prompt: str, model: str, ratio: str, size: str, reference: Optional[any]
-    ) -> GeneratedMedia:
-        """Generate image using Gemini native image generation."""
-        contents = []
-
-        # Add reference image if provided
-        if reference:
-            ref_data, ref_mime = self._load_media(reference)
-            contents.append(types.Part.from_bytes(data=ref_data, mime_type=ref_mime))
+        images = self._imagen_media(response, model, ratio)
+        if not images:
+            raise RuntimeError("No image generated")
+        return images[0]
+
+    async def _aimagine_imagen(
+        self, aclient, prompt: str, model: str, ratio: str, size: str, count: int
+    ) -> List[GeneratedMedia]:
+        """Async Imagen generation. Returns every generated image."""
+        try:
+            response = await aclient.models.generate_images(
+                model=model,
+                prompt=prompt,
+                config=self._imagen_config(model, ratio, size, count),
+            )
+        except Exception as e:
+            raise _wrap_generation_error(e, f"Image generation ({model})")
 
-        contents.append(prompt)
+        return self._imagen_media(response, model, ratio)
 
-        # Build image config
+    @staticmethod
+    def _gemini_image_config(model: str, ratio: str, size: str) -> types.GenerateContentConfig:
+        """Build Gemini native image generation config."""
         img_config_args = {'aspect_ratio': ratio}
         # Only add size if model supports it
         if 'pro' in model.lower():
             img_config_args['image_size'] = size
 
-        try:
-            response = self.client.models.generate_content(
-                model=model,
-                contents=contents,
-                config=types.GenerateContentConfig(
-                    response_modalities=['IMAGE'],
-                    image_config=types.ImageConfig(**img_config_args),
-                ),
-            )
-        except Exception as e:
-            raise _wrap_generation_error(e, f"Image generation ({model})")
+        return types.GenerateContentConfig(
+            response_modalities=['IMAGE'],
+            image_config=types.ImageConfig(**img_config_args),
+        )
 
-        # Extract image from response
+    @staticmethod
+    def _gemini_image_media(response, model: str, ratio: str) -> GeneratedMedia:
+        """Extract the generated image from a Gemini response."""
         for part in response.candidates[0].content.parts:
             if part.inline_data:
                 return GeneratedMedia(
@@ -514,6 +991,43 @@ class MMIO:
 
         raise RuntimeError("No image generated")
 
+    def _imagine_gemini(
+        self, prompt: str, model: str, ratio: str, size: str, reference: Optional[any]
+    ) -> GeneratedMedia:
+        """Generate image using Gemini native image generation."""
+        config = self._gemini_image_config(model, ratio, size)
+
+        contents = [self._media_part(reference), prompt] if reference else [prompt]
+
+        try:
+            response = self.client.models.generate_content(
+                model=model,
+                contents=contents,
+                config=config,
+            )
+        except Exception as e:
+            raise _wrap_generation_error(e, f"Image generation ({model})")
+
+        return self._gemini_image_media(response, model, ratio)
+
+    async def _aimagine_gemini(
+        self, aclient, prompt: str, model: str, ratio: str, size: str,
+        ref_part: Optional[types.Part],
+    ) -> GeneratedMedia:
+        """Async Gemini native image generation with a pre-built reference part."""
+        contents = [ref_part, prompt] if ref_part else [prompt]
+
+        try:
+            response = await aclient.models.generate_content(
+                model=model,
+                contents=contents,
+                config=self._gemini_image_config(model, ratio, size),
+            )
+        except Exception as e:
+            raise _wrap_generation_error(e, f"Image generation ({model})")
+
+        return self._gemini_image_media(response, model, ratio)
+
     def video(
         self,
         prompt: str,
@@ -544,14 +1058,17 @@ class MMIO:
             'resolution': resolution,
         }
 
-        # Load frames if provided
+        # Load frames if provided (both in parallel)
+        start_future = _EXEC.submit(self._load_media_bytes, start_frame, resize=False) if start_frame else None
+        end_future = _EXEC.submit(self._load_media_bytes, end_frame, resize=False) if end_frame else None
+
         first_frame = None
-        if start_frame:
-            frame_data, frame_mime = self._load_media(start_frame)
+        if start_future:
+            frame_data, frame_mime = start_future.result()
             first_frame = types.Image(image_bytes=frame_data, mime_type=frame_mime)
 
-        if end_frame:
-            end_data, end_mime = self._load_media(end_frame)
+        if end_future:
+            end_data, end_mime = end_future.result()
             config_args['last_frame'] = types.Image(image_bytes=end_data, mime_type=end_mime)
 
         # Start generation
@@ -564,9 +1081,7 @@ class MMIO:
             )
 
             # Poll until complete
-            while not operation.done:
-                time.sleep(5)
-                operation = self.client.operations.get(operation)
+            operation = _poll(operation, self.client.operations.get, lambda op: op.done)
 
             # Download result
             video = operation.response.generated_videos[0]
@@ -576,13 +1091,12 @@ class MMIO:
         except Exception as e:
             raise _wrap_generation_error(e, f"Video generation ({model})")
 
-        # Save to temp and read
+        # Write once to disk; bytes are only read back if .data is accessed
         temp_path = self._output_dir / f"video_{int(time.time())}.mp4"
         temp_path.parent.mkdir(parents=True, exist_ok=True)
         video.video.save(str(temp_path))
 
         return GeneratedMedia(
-            data=temp_path.read_bytes(),
             path=str(temp_path),
             mime_type='video/mp4',
             metadata={'model': model, 'resolution': resolution, 'ratio': ratio},
@@ -621,11 +1135,11 @@ class MMIO:
 
         return self.process(source, prompt, model=model or self.MODELS['transcribe'])
 
-    def _is_audio(self, source: Union[str, Path, bytes]) -> bool:
+    @classmethod
+    def _is_audio(cls, source: Union[str, Path, bytes]) -> bool:
         """Check if source is audio based on extension."""
         if isinstance(source, (str, Path)):
-            ext = Path(source).suffix.lower()
-            return ext in {'.mp3', '.wav', '.flac', '.aac', '.ogg', '.m4a'}
+            return Path(source).suffix.lower() in cls._AUDIO_EXTS
         return False
 
     def convert(
@@ -662,14 +1176,18 @@ def main():
         formatter_class=argparse.RawDescriptionHelpFormatter,
     )
 
+    parser.add_argument('--cache', action='store_true',
+                        help=f'Reuse responses for identical requests (stored in {DEFAULT_CACHE_DIR})')
     subparsers = parser.add_subparsers(dest='command', required=True)
 
     # Process command
     proc = subparsers.add_parser('process', help='Process media with prompt')
-    proc.add_argument('file', help='Input file path or YouTube URL')
+    proc.add_argument('file', nargs='+', help='Input file path(s) or YouTube URL(s)')
     proc.add_argument('--prompt', '-p', required=True, help='Processing prompt')
     proc.add_argument('--model', '-m', help='Model override')
     proc.add_argument('--json', action='store_true', help='Output JSON')
+    proc.add_argument('--concurrency', '-c', type=int, default=8, help='Max parallel requests for multiple files')
+    proc.add_argument('--resize', action='store_true', help='Downscale images to max 1024px edge before sending')
     proc.add_argument('--output', '-o', help='Save result to file (markdown)')
 
     # Imagine command
@@ -704,16 +1222,26 @@ def main():
     args = parser.parse_args()
 
     try:
-        mm = MMIO()
+        mm = MMIO(
+            auto_resize=getattr(args, 'resize', False),
+            cache_dir=DEFAULT_CACHE_DIR if args.cache else None,
+        )
 
         if args.command == 'process':
-            result = mm.process(args.file, args.prompt, model=args.model, output_json=args.json)
+            if len(args.file) > 1:
+                results = mm.process_many(
+                    args.file, args.prompt, concurrency=args.concurrency,
+                    model=args.model, output_json=args.json,
+                )
+                text = '\n\n'.join(f"## {f}\n\n{r.text}" for f, r in zip(args.file, results))
+            else:
+                text = mm.process(args.file[0], args.prompt, model=args.model, output_json=args.json).text
             if args.output:
                 Path(args.output).parent.mkdir(parents=True, exist_ok=True)
-                Path(args.output).write_text(result.text, encoding='utf-8')
+                Path(args.output).write_text(text, encoding='utf-8')
                 print(f"Saved: {args.output}")
             else:
-                print(result.text)
+                print(text)
 
         elif args.command == 'imagine':
             media = mm.imagine(args.prompt, model=args.model, ratio=args.ratio, size=args.size)
@@ -725,7 +1253,9 @@ def main():
             media = mm.video(args.prompt, model=args.model, resolution=args.resolution, ratio=args.ratio)
             out = args.output or media.path
             if args.output:
-                media.save(out)
+                # Rename the downloaded file rather than copying the video bytes
+                Path(out).parent.mkdir(parents=True, exist_ok=True)
+                shutil.move(media.path, out)
             print(f"Saved: {out}")
 
         elif args.command == 'transcribe':